@@ -1,78 +1,159 @@
 import sys
+import copy
 import json
+import math
+import argparse
+from collections import OrderedDict
 from pathlib import Path
-import click
-import yaml
+from typing import List, Optional
+from src.data import ELEMENTS
 from src.model import RefrigerantOptimizer
 
-def _load_yaml(path: Path) -> dict:
-    data = yaml.safe_load(path.read_text())
+try:  # optional C-accelerated JSON writer
+    import orjson
+except ImportError:
+    orjson = None
+
+# parsed mix files keyed by absolute path -> (mtime_ns, size, data), in LRU order
+_YAML_CACHE: "OrderedDict[Path, tuple[int, int, dict]]" = OrderedDict()
+_YAML_CACHE_SIZE = 100
+
+def _validate_mix(data) -> dict:
+    """Check a parsed mix in one pass and normalise its masses to floats.
+
+    Runs only when a file is (re)parsed; cached loads are already valid.
+    """
     if not isinstance(data, dict):
-        raise click.BadParameter("YAML must map keys to values")
-    return data
-
-@click.group(context_settings={"help_option_names": ["-h", "--help"]}, help="Refrigerant optimisation commands")
-def main():
-    pass
-
-@main.command()
-@click.option("--mix", type=click.Path(exists=True, dir_okay=False), required=True,
-              help="YAML file mapping each element to its current mass (kg)")
-@click.option("--target", type=float, default=None, help="Target total weight after refuel (kg)")
-def refuel(mix: str, target: float):
-    comp = _load_yaml(Path(mix))
-    opt = RefrigerantOptimizer("refuel", initial_composition=comp, target_weight=target)
-    click.echo(json.dumps(opt.optimize(), indent=2))
-
-@main.command("new-blend")
-@click.option("--weight", type=float, required=True, help="Desired weight of the new blend (kg)")
-def new_blend(weight: float):
-    opt = RefrigerantOptimizer("new_blend", target_weight=weight)
-    click.echo(json.dumps(opt.optimize(), indent=2))
-
-@main.command("optimise")
-@click.option(
-    "--mix",
-    type=click.Path(exists=True, dir_okay=False),
-    required=True,
-    help="YAML file mapping each element to its current mass (kg)",
-)
-@click.option(
-    "--target",
-    type=float,
-    required=True,
-    help="Desired total weight after optimisation (kg)",
-)
-def optimise_mix(mix: str, target: float):
+        raise ValueError("YAML must map keys to values")
+    mix = {}
+    for element, mass in data.items():
+        if element not in ELEMENTS:
+            raise ValueError(
+                f"Unknown element '{element}' – expected one of {', '.join(ELEMENTS)}."
+            )
+        if (
+            isinstance(mass, bool)
+            or not isinstance(mass, (int, float))
+            or not (math.isfinite(mass) and mass >= 0)
+        ):
+            raise ValueError(f"Mass of element '{element}' must be a finite, non-negative number.")
+        mix[element] = float(mass)
+    return mix
+
+def _load_yaml(path: Path) -> dict:
+    key = path.resolve()
+    st = key.stat()
+    cached = _YAML_CACHE.get(key)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        _YAML_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+
+    # deferred so --help and new-blend never pay for importing PyYAML;
+    # libyaml-backed loader when available, pure-Python fallback otherwise
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    data = _validate_mix(yaml.load(key.read_bytes(), Loader=loader))
+
+    _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+    _YAML_CACHE.move_to_end(key)
+    if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+        _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(data)
+
+def _mix_file(value: str) -> Path:
+    path = Path(value)
+    if path.is_dir():
+        raise argparse.ArgumentTypeError(f"File '{value}' is a directory.")
+    if not path.is_file():
+        raise argparse.ArgumentTypeError(f"File '{value}' does not exist.")
+    return path
+
+def _finite_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a valid number.") from None
+    if not math.isfinite(number):
+        raise argparse.ArgumentTypeError(f"'{value}' is not a finite number.")
+    return number
+
+def refuel(args: argparse.Namespace) -> dict:
+    """Top up an existing charge within the refuel cap (Scenario 1)."""
+    comp = _load_yaml(args.mix)
+    opt = RefrigerantOptimizer("refuel", initial_composition=comp, target_weight=args.target)
+    return opt.optimize()
+
+def new_blend(args: argparse.Namespace) -> dict:
+    """Formulate a fresh blend from scratch (Scenario 2)."""
+    opt = RefrigerantOptimizer("new_blend", target_weight=args.weight)
+    return opt.optimize()
+
+def optimise_mix(args: argparse.Namespace) -> dict:
     """Solve the combined optimisation model (Scenario 3)."""
-    comp = _load_yaml(Path(mix))
+    comp = _load_yaml(args.mix)
     opt = RefrigerantOptimizer(
-        "optimise_mixture", initial_composition=comp, target_weight=target
+        "optimise_mixture", initial_composition=comp, target_weight=args.target
     )
-    click.echo(json.dumps(opt.optimize(), indent=2))
-
-@main.command("auto")
-@click.option(
-    "--mix",
-    type=click.Path(exists=True, dir_okay=False),
-    required=True,
-    help="YAML file mapping each element to its current mass (kg)",
-)
-@click.option(
-    "--target",
-    type=float,
-    required=True,
-    help="Desired total weight after optimisation (kg)",
-)
-def auto_mix(mix: str, target: float):
+    return opt.optimize()
+
+def auto_mix(args: argparse.Namespace) -> dict:
     """Run the optimiser in *auto* mode (currently an alias of optimise_mixture)."""
-    comp = _load_yaml(Path(mix))
-    opt = RefrigerantOptimizer("auto", initial_composition=comp, target_weight=target)
-    click.echo(json.dumps(opt.optimize(), indent=2))
+    comp = _load_yaml(args.mix)
+    opt = RefrigerantOptimizer("auto", initial_composition=comp, target_weight=args.target)
+    return opt.optimize()
 
-if __name__ == "__main__":
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="refrigerant-opt", description="Refrigerant optimisation commands"
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    def add_command(name: str, func) -> argparse.ArgumentParser:
+        sub = commands.add_parser(name, help=func.__doc__, description=func.__doc__)
+        sub.set_defaults(func=func)
+        return sub
+
+    mix_help = "YAML file mapping each element to its current mass (kg)"
+
+    sub = add_command("refuel", refuel)
+    sub.add_argument("--mix", type=_mix_file, required=True, help=mix_help)
+    sub.add_argument("--target", type=_finite_float, default=None,
+                     help="Target total weight after refuel (kg)")
+
+    sub = add_command("new-blend", new_blend)
+    sub.add_argument("--weight", type=_finite_float, required=True,
+                     help="Desired weight of the new blend (kg)")
+
+    for name, func in (("optimise", optimise_mix), ("auto", auto_mix)):
+        sub = add_command(name, func)
+        sub.add_argument("--mix", type=_mix_file, required=True, help=mix_help)
+        sub.add_argument("--target", type=_finite_float, required=True,
+                         help="Desired total weight after optimisation (kg)")
+
+    return parser
+
+def _write_json(result: dict) -> None:
+    if orjson is None:
+        print(json.dumps(result, indent=2))
+        return
+    data = orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:  # text-only stream, e.g. redirect_stdout(io.StringIO())
+        print(data.decode(), end="")
+        return
+    sys.stdout.flush()
+    buffer.write(data)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
     try:
-        main()
+        result = args.func(args)
     except Exception as exc:
-        click.echo(str(exc), err=True)
-        sys.exit(1)
\ No newline at end of file
+        print(str(exc), file=sys.stderr)
+        return 1
+    _write_json(result)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,4 +8,9 @@ DEFAULT_RATIOS = {'A': 4, 'B': 3, 'C': 2, 'D': 1}
 
 MAX_REFUEL_PERCENTAGE = 0.15
 
-ELEMENTS = ['A', 'B', 'C', 'D']
\ No newline at end of file
+ELEMENTS = ('A', 'B', 'C', 'D')
+
+# positional views of the tables above, aligned with ELEMENTS
+RATIOS = tuple(DEFAULT_RATIOS[e] for e in ELEMENTS)
+ADDITION_PRICES = tuple(ELEMENT_PRICES[e]['addition'] for e in ELEMENTS)
+EXTRACTION_PRICES = tuple(ELEMENT_PRICES[e]['extraction'] for e in ELEMENTS)
\ No newline at end of file
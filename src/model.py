@@ -1,9 +1,112 @@
-import pulp
-from src.data import ELEMENT_PRICES, DEFAULT_RATIOS, MAX_REFUEL_PERCENTAGE, ELEMENTS
-from typing import Optional, Dict
+import math
+from functools import lru_cache
+from itertools import combinations
+from src.data import (
+    MAX_REFUEL_PERCENTAGE,
+    ELEMENTS,
+    RATIOS,
+    ADDITION_PRICES,
+    EXTRACTION_PRICES,
+)
+from typing import Optional, Dict, Tuple
+
+# every non-empty subset of element positions a blend may be built from
+_SUBSETS = tuple(
+    subset
+    for size in range(1, len(ELEMENTS) + 1)
+    for subset in combinations(range(len(ELEMENTS)), size)
+)
+
+
+def _cheapest_blend():
+    """Return the per-kg shares and per-kg extraction cost of the cheapest blend.
+
+    A blend's cost is linear in its weight, so the winning subset does not
+    depend on the target and can be found once at import time.
+    """
+    best_cost, best_subset = None, None
+    for subset in _SUBSETS:
+        total = sum(RATIOS[i] for i in subset)
+        cost = sum(EXTRACTION_PRICES[i] * RATIOS[i] for i in subset) / total
+        if best_cost is None or cost < best_cost:
+            best_cost, best_subset = cost, subset
+
+    total = sum(RATIOS[i] for i in best_subset)
+    shares = tuple(r / total if i in best_subset else 0.0 for i, r in enumerate(RATIOS))
+    return shares, best_cost
+
+
+_BLEND_SHARES, _BLEND_UNIT_COST = _cheapest_blend()
+
+
+# The solve cores below take hashable, ELEMENTS-aligned mass tuples and return
+# tuples only, so repeated identical queries are answered from the cache and
+# callers can never mutate a cached result.
+
+@lru_cache(maxsize=128)
+def _solve_refuel(current: Tuple[float, ...], target_weight: Optional[float]):
+    """Cheapest ratio-preserving top-up of a non-empty *current* charge.
+
+    Returns ``(cost, additions, final)`` or None when the 15 % cap makes the
+    ratios (or *target_weight*) unreachable.
+    """
+    # admissible scale: nothing may be removed (lower), 15 % cap per element (upper)
+    scale_min = max(m / r for m, r in zip(current, RATIOS))
+    scale_max = min(m * (1 + MAX_REFUEL_PERCENTAGE) / r for m, r in zip(current, RATIOS))
+    if target_weight is None:
+        scale = scale_min
+    else:
+        scale = target_weight / sum(RATIOS)
+
+    if not scale_min - 1e-6 <= scale <= scale_max + 1e-6:
+        return None
+
+    add = tuple(max(0.0, r * scale - m) for m, r in zip(current, RATIOS))
+    final = tuple(float(m + a) for m, a in zip(current, add))
+    cost = sum(p * a for p, a in zip(ADDITION_PRICES, add))
+    return cost, add, final
+
+
+@lru_cache(maxsize=128)
+def _solve_mixture(current: Tuple[float, ...], target_weight: float):
+    """Cheapest way from *current* to a ratio-compliant *target_weight* blend.
+
+    Returns ``(cost, additions, removals, extractions, final)``.
+    """
+    best = None
+    for subset in _SUBSETS:
+        scale = target_weight / sum(RATIOS[i] for i in subset)
+        final = tuple(float(r * scale) if i in subset else 0.0 for i, r in enumerate(RATIOS))
+        plan = _reach(current, final)
+        if best is None or plan[0] < best[0]:
+            best = plan
+    return best
+
+
+def _reach(current: Tuple[float, ...], final: Tuple[float, ...]):
+    """Cheapest per-element moves from *current* to *final*.
+
+    Surpluses are removed (charged at the extraction price); shortfalls are
+    topped up with capped additions only where those beat fresh extraction.
+    """
+    additions, removals, extractions = [], [], []
+    cost = 0.0
+    for m, q, add_price, ext_price in zip(current, final, ADDITION_PRICES, EXTRACTION_PRICES):
+        delta = q - m
+        add = remove = new = 0.0
+        if delta < 0:
+            remove = -delta
+        elif add_price < ext_price:
+            add = min(delta, m * MAX_REFUEL_PERCENTAGE)
+            new = delta - add
+        else:
+            new = delta
+        additions.append(float(add))
+        removals.append(float(remove))
+        extractions.append(float(new))
+        cost += add_price * add + ext_price * (new + remove)
+    return cost, tuple(additions), tuple(removals), tuple(extractions), final
 
-BIG_M = 1e5  # sufficiently large constant for Big-M formulations
-EPSILON = 1e-6  # tiny positive number for linking binary/select variables
 
 class RefrigerantOptimizer:
     _OPERATIONS = {"refuel", "new_blend", "optimise_mixture", "auto"}
@@ -36,7 +139,7 @@ class RefrigerantOptimizer:
             raise ValueError("target_weight must be supplied for a new blend.")
 
         if self.operation == "refuel" and self.target_weight is not None:
-            current_mass = self._current_mass(self.initial_composition)
+            current_mass = sum(self._vector(self.initial_composition))
             max_possible = current_mass * (1 + MAX_REFUEL_PERCENTAGE)
             if self.target_weight > max_possible + 1e-6:
                 raise ValueError(
@@ -44,23 +147,20 @@ class RefrigerantOptimizer:
                 )
 
     @staticmethod
-    def _current_mass(mix: Dict[str, float]) -> float:
-        return sum(mix.get(e, 0.0) for e in ELEMENTS)
-
-    @staticmethod
-    def _enforce_ratios(model: pulp.LpProblem, qty, used):
-        """Enforce DEFAULT_RATIOS inside the selected subset (used==1)."""
-        for i, ei in enumerate(ELEMENTS[:-1]):
-            for ej in ELEMENTS[i + 1 :]:
-                ri, rj = DEFAULT_RATIOS[ei], DEFAULT_RATIOS[ej]
-                diff = qty[ei] * rj - qty[ej] * ri
-                model += diff <= BIG_M * (2 - used[ei] - used[ej])
-                model += -diff <= BIG_M * (2 - used[ei] - used[ej])
+    def _vector(mix: Dict[str, float]) -> Tuple[float, ...]:
+        """Element masses of *mix* as a tuple aligned with ELEMENTS."""
+        return tuple(mix.get(e, 0.0) for e in ELEMENTS)
 
     def refuel(self, initial_mix: Dict[str, float], target_weight: Optional[float] = None):
-        """Optimise a refuel operation under the required constraints."""
-        current = {e: initial_mix.get(e, 0.0) for e in ELEMENTS}
-        current_mass = self._current_mass(current)
+        """Optimise a refuel operation under the required constraints.
+
+        The final charge is DEFAULT_RATIOS times a single scale factor, so no
+        solver is needed: the cheapest refuel uses the smallest scale that
+        requires no extraction (or the one fixed by *target_weight*), provided
+        no element exceeds its 15 % cap.
+        """
+        current = self._vector(initial_mix)
+        current_mass = sum(current)
 
         if current_mass == 0:
             empty = {e: 0.0 for e in ELEMENTS}
@@ -71,76 +171,37 @@ class RefrigerantOptimizer:
                 "final_composition": empty,
             }
 
-        add = {e: pulp.LpVariable(f"add_{e}", lowBound=0) for e in ELEMENTS}
-        model = pulp.LpProblem("refuel", pulp.LpMinimize)
-
-        # objective – minimise addition cost
-        model += pulp.lpSum(ELEMENT_PRICES[e]["addition"] * add[e] for e in ELEMENTS)
-
-        # 15 % cap per element
-        for e in ELEMENTS:
-            model += add[e] <= current[e] * MAX_REFUEL_PERCENTAGE
-
-        # keep the overall 4:3:2:1 ratio in the *final* mixture
-        scale = pulp.LpVariable("scale", lowBound=0)
-
-        for e in ELEMENTS:
-            model += current[e] + add[e] == DEFAULT_RATIOS[e] * scale
+        if target_weight is not None and target_weight < current_mass - 1e-6:
+            raise ValueError("target_weight below current weight – extraction required.")
 
-        # optional exact-weight requirement
-        if target_weight is not None:
-            if target_weight < current_mass - 1e-6:
-                raise ValueError("target_weight below current weight – extraction required.")
-            model += pulp.lpSum(add.values()) == target_weight - current_mass
-
-        model.solve(pulp.PULP_CBC_CMD(msg=False))
-        status = pulp.LpStatus[model.status]
-        if status != "Optimal":
-            return {"status": status}
-
-        additions = {e: float(add[e].value() or 0.0) for e in ELEMENTS}
-        final = {e: current[e] + additions[e] for e in ELEMENTS}
-        cost = float(pulp.value(model.objective) or 0.0)
+        plan = _solve_refuel(current, target_weight)
+        if plan is None:
+            return {"status": "Infeasible"}
 
+        cost, add, final = plan
         return {
-            "status": status,
-            "total_cost": cost,
-            "additions": additions,
-            "final_composition": final,
+            "status": "Optimal",
+            "total_cost": float(cost),
+            "additions": dict(zip(ELEMENTS, add)),
+            "final_composition": dict(zip(ELEMENTS, final)),
         }
 
     def new_blend(self, target_weight: float):
-        """Design a fresh refrigerant blend of target_weight kilograms."""
-        if target_weight <= 0:
-            raise ValueError("target_weight must be positive.")
-
-        qty = {e: pulp.LpVariable(f"qty_{e}", lowBound=0) for e in ELEMENTS}
-        used = {e: pulp.LpVariable(f"used_{e}", cat="Binary") for e in ELEMENTS}
-        model = pulp.LpProblem("new_blend", pulp.LpMinimize)
-
-        # objective – minimise extraction cost of the new blend
-        model += pulp.lpSum(ELEMENT_PRICES[e]["extraction"] * qty[e] for e in ELEMENTS)
-
-        # total mass requirement
-        model += pulp.lpSum(qty.values()) == target_weight
-
-        # at least one element must be present in the new blend
-        model += pulp.lpSum(used.values()) >= 1
-
-        for e in ELEMENTS:
-            model += qty[e] <= target_weight * used[e]
+        """Design a fresh refrigerant blend of target_weight kilograms.
 
-        self._enforce_ratios(model, qty, used)
-
-        model.solve(pulp.PULP_CBC_CMD(msg=False))
-        status = pulp.LpStatus[model.status]
+        Within any chosen subset of elements the ratios fix the composition,
+        so the cheapest subset (see _cheapest_blend) is simply scaled up.
+        """
+        if not (math.isfinite(target_weight) and target_weight > 0):
+            raise ValueError("target_weight must be positive and finite.")
 
-        composition = {e: float(qty[e].value() or 0.0) for e in ELEMENTS}
-        cost = float(pulp.value(model.objective) or 0.0)
+        composition = {
+            e: float(share * target_weight) for e, share in zip(ELEMENTS, _BLEND_SHARES)
+        }
 
         return {
-            "status": status,
-            "total_cost": cost,
+            "status": "Optimal",
+            "total_cost": float(_BLEND_UNIT_COST * target_weight),
             "extractions": composition,
             "final_composition": composition,
         }
@@ -152,87 +213,29 @@ class RefrigerantOptimizer:
     ):
         """Find the cheapest way to reach *target_weight* kilograms.
 
-        The solver can:
+        The optimiser can:
         • remove any amount of the current charge (remove_e),
         • add up to 15 % of each original component (add_e), and/or
         • produce a brand-new quantity of each component (new_e).
 
         The final composition must satisfy the 4∶3∶2∶1 ratios inside the
         chosen subset of elements, and at least one element must remain.
+        Fixing the subset fixes every final mass, after which each element is
+        priced on its own, so all subsets are enumerated and the cheapest kept.
         """
 
-        if target_weight <= 0:
-            raise ValueError("target_weight must be positive.")
-
-        current = {e: initial_mix.get(e, 0.0) for e in ELEMENTS}
-        current_mass = self._current_mass(current)
-
-        # decision variables
-        add = {e: pulp.LpVariable(f"add_{e}", lowBound=0) for e in ELEMENTS}
-        remove = {
-            e: pulp.LpVariable(f"remove_{e}", lowBound=0, upBound=current[e])
-            for e in ELEMENTS
-        }
-        new = {e: pulp.LpVariable(f"new_{e}", lowBound=0) for e in ELEMENTS}
-
-        used = {e: pulp.LpVariable(f"used_{e}", cat="Binary") for e in ELEMENTS}
-
-        model = pulp.LpProblem("combined_refrigerant_optimisation", pulp.LpMinimize)
-
-        # objective
-        # cost of operations: adding fresh material, extracting new material and
-        # discarding (removing) existing material incur their respective unit
-        # costs.  Removal is treated the same as an extraction cost-wise.
-        model += pulp.lpSum(
-            ELEMENT_PRICES[e]["addition"] * add[e]
-            + ELEMENT_PRICES[e]["extraction"] * (new[e] + remove[e])
-            for e in ELEMENTS
-        )
-
-        # constraints
-        # 15 % cap on additions to the *current* stock
-        for e in ELEMENTS:
-            model += add[e] <= current[e] * MAX_REFUEL_PERCENTAGE
-
-        # final quantity of each element after all operations
-        qty = {
-            e: current[e] + add[e] - remove[e] + new[e] for e in ELEMENTS
-        }
-
-        # link binary *used* indicator to presence in the final mixture
-        for e in ELEMENTS:
-            model += qty[e] <= target_weight * used[e]
-            model += qty[e] >= EPSILON * used[e]
-
-        # at least one element must remain in the final blend
-        model += pulp.lpSum(used.values()) >= 1
-
-        # total mass requirement
-        model += pulp.lpSum(qty.values()) == target_weight
-
-        # enforce 4∶3∶2∶1 ratios inside the selected subset
-        self._enforce_ratios(model, qty, used)
-
-        # solve
-        model.solve(pulp.PULP_CBC_CMD(msg=False))
-        status = pulp.LpStatus[model.status]
-
-        if status != "Optimal":
-            return {"status": status}
-
-        additions = {e: float(add[e].value() or 0.0) for e in ELEMENTS}
-        removals = {e: float(remove[e].value() or 0.0) for e in ELEMENTS}
-        extractions = {e: float(new[e].value() or 0.0) for e in ELEMENTS}
-        final = {e: float(qty[e].value() or 0.0) for e in ELEMENTS}
-        cost = float(pulp.value(model.objective) or 0.0)
+        if not (math.isfinite(target_weight) and target_weight > 0):
+            raise ValueError("target_weight must be positive and finite.")
 
+        plan = _solve_mixture(self._vector(initial_mix), target_weight)
+        cost, additions, removals, extractions, final = plan
         return {
-            "status": status,
-            "total_cost": cost,
-            "additions": additions,
-            "removals": removals,
-            "extractions": extractions,
-            "final_composition": final,
+            "status": "Optimal",
+            "total_cost": float(cost),
+            "additions": dict(zip(ELEMENTS, additions)),
+            "removals": dict(zip(ELEMENTS, removals)),
+            "extractions": dict(zip(ELEMENTS, extractions)),
+            "final_composition": dict(zip(ELEMENTS, final)),
         }
 
     # Public helpers
@@ -242,9 +245,8 @@ class RefrigerantOptimizer:
         For elements not present we simply return 0.0.
         """
 
-        if not self.initial_composition:
-            return {e: 0.0 for e in ELEMENTS}
-        return {e: self.initial_composition.get(e, 0.0) * MAX_REFUEL_PERCENTAGE for e in ELEMENTS}
+        current = self._vector(self.initial_composition)
+        return {e: m * MAX_REFUEL_PERCENTAGE for e, m in zip(ELEMENTS, current)}
 
     # Optimisation
     def optimize(self) -> Dict[str, float]:
@@ -0,0 +1,132 @@
+import io
+import os
+import json
+import contextlib
+from pathlib import Path
+
+import pytest
+import src.cli
+from src.cli import _load_yaml, _write_json, main
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+def test_load_yaml_normalises_masses(tmp_path):
+    mix = tmp_path / "mix.yaml"
+    mix.write_text("A: 40\nB: 30.5\n")
+    assert _load_yaml(mix) == {"A": 40.0, "B": 30.5}
+
+
+def test_load_yaml_sees_file_changes(tmp_path):
+    mix = tmp_path / "mix.yaml"
+    mix.write_text("A: 40\n")
+    first = _load_yaml(mix)
+    assert first == {"A": 40}
+    first["A"] = 0  # mutating a result must not leak into the cache
+    assert _load_yaml(mix) == {"A": 40}
+
+    # same size and same mtime: served from the cache without re-reading
+    st = mix.stat()
+    mix.write_text("A: 41\n")
+    os.utime(mix, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert _load_yaml(mix) == {"A": 40}
+
+    # same size but a newer mtime invalidates the entry
+    os.utime(mix, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert _load_yaml(mix) == {"A": 41}
+
+    # a size change invalidates it too, even with the mtime restored
+    mix.write_text("A: 41\nD: 10\n")
+    os.utime(mix, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert _load_yaml(mix) == {"A": 41, "D": 10}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "- 1\n- 2\n",
+        "A: 40\nE: 1\n",
+        "A: -1\n",
+        "A: lots\n",
+        "A: true\n",
+        "A: .inf\n",
+        "A: .nan\n",
+    ],
+)
+def test_load_yaml_rejects_invalid_mix(tmp_path, content):
+    mix = tmp_path / "mix.yaml"
+    mix.write_text(content)
+    with pytest.raises(ValueError):
+        _load_yaml(mix)
+
+
+def test_main_new_blend(capsys):
+    assert main(["new-blend", "--weight", "80"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["status"] == "Optimal"
+    assert out["final_composition"]["C"] == 80.0
+
+
+def test_main_refuel(capsys):
+    assert main(["refuel", "--mix", str(EXAMPLES / "scenario1.yaml"), "--target", "115"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["status"] == "Optimal"
+    assert out["additions"] == {"A": 6.0, "B": 4.5, "C": 3.0, "D": 1.5}
+
+
+def test_main_reports_errors_on_stderr(capsys):
+    assert main(["new-blend", "--weight", "0"]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "target_weight must be positive" in captured.err
+
+
+def test_main_rejects_missing_mix_file(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["optimise", "--mix", str(tmp_path / "missing.yaml"), "--target", "10"])
+    assert exc.value.code == 2
+    assert "does not exist" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_json(monkeypatch, capsysbinary, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(src.cli, "orjson", None)
+    result = {"status": "Optimal", "final_composition": {"A": 40.0, "B": 0.0}}
+
+    _write_json(result)
+    out = capsysbinary.readouterr().out
+    assert out.endswith(b"}\n")
+    assert b'\n  "status": "Optimal",\n' in out
+    assert json.loads(out) == result
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_json_to_text_only_stream(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(src.cli, "orjson", None)
+
+    stream = io.StringIO()
+    with contextlib.redirect_stdout(stream):
+        _write_json({"total_cost": 120.0})
+    assert json.loads(stream.getvalue()) == {"total_cost": 120.0}
+    assert stream.getvalue().endswith("}\n")
+
+
+def test_main_rejects_directory_as_mix_file(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["refuel", "--mix", str(tmp_path)])
+    assert exc.value.code == 2
+    assert "is a directory" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("weight", ["nan", "inf", "-inf", "heavy"])
+def test_main_rejects_non_finite_numbers(capsys, weight):
+    with pytest.raises(SystemExit) as exc:
+        main(["new-blend", f"--weight={weight}"])
+    assert exc.value.code == 2
+    assert weight in capsys.readouterr().err
@@ -1,5 +1,6 @@
 import pytest
-from src.model import RefrigerantOptimizer
+import src.model
+from src.model import RefrigerantOptimizer, _solve_mixture, _solve_refuel
 import math
 from src.data import DEFAULT_RATIOS, ELEMENT_PRICES
 
@@ -9,6 +10,7 @@ from src.data import DEFAULT_RATIOS, ELEMENT_PRICES
     [
         ({"A": 40, "B": 30, "C": 20, "D": 10}, None, "Optimal"),
         ({}, None, "Nothing to refuel"),
+        ({"A": 40, "B": 10, "C": 20, "D": 10}, None, "Infeasible"),
     ],
 )
 def test_refuel(initial, target, expected_status):
@@ -25,6 +27,13 @@ def test_max_additions():
     assert opt.calculate_max_additions() == {"A": 6.0, "B": 4.5, "C": 3.0, "D": 1.5}
 
 
+def test_max_additions_track_composition_changes():
+    sample = {"A": 40, "B": 30, "C": 20, "D": 10}
+    opt = RefrigerantOptimizer("refuel", initial_composition=sample)
+    opt.initial_composition["A"] = 80
+    assert opt.calculate_max_additions()["A"] == 12.0
+
+
 def test_basic_attributes():
     base = {"A": 1}
     opt = RefrigerantOptimizer("refuel", initial_composition=base)
@@ -40,6 +49,13 @@ def test_new_blend(weight):
     assert abs(sum(res["final_composition"].values()) - weight) < 1e-6
 
 
+@pytest.mark.parametrize("weight", [0, -5, math.nan, math.inf])
+def test_new_blend_rejects_invalid_weight(weight):
+    opt = RefrigerantOptimizer("new_blend", target_weight=weight)
+    with pytest.raises(ValueError):
+        opt.optimize()
+
+
 def test_invalid_operation():
     with pytest.raises(ValueError):
         RefrigerantOptimizer("invalid")
@@ -121,4 +137,99 @@ def test_optimise_mixture_scenario3():
     assert _ratio_holds(final)
 
     # The theoretical lower bound is removing exactly 12, 9, 6, 3 kg respectively (cost ≈ 159).
-    assert res["total_cost"] <= 160  # small buffer to adjust for noise
\ No newline at end of file
+    assert res["total_cost"] <= 160  # small buffer to adjust for noise
+
+
+@pytest.mark.parametrize(
+    "initial,target,expected_cost,expected_final",
+    [
+        # off-ratio surplus of D is cut back, the shortfall is freshly extracted
+        (
+            {"A": 40, "B": 30, "C": 20, "D": 30},
+            130,
+            257.0,
+            {"A": 52.0, "B": 39.0, "C": 26.0, "D": 13.0},
+        ),
+        # dropping C entirely is cheaper than rebalancing all four elements
+        (
+            {"A": 40, "B": 30, "C": 60, "D": 10},
+            80,
+            240.0,
+            {"A": 40.0, "B": 30.0, "C": 0.0, "D": 10.0},
+        ),
+    ],
+)
+def test_optimise_mixture_rebalances_off_ratio_charge(
+    initial, target, expected_cost, expected_final
+):
+    """Expected values cross-checked against the original CBC Big-M model."""
+
+    opt = RefrigerantOptimizer(
+        "optimise_mixture", initial_composition=initial, target_weight=target
+    )
+    res = opt.optimize()
+
+    assert res["status"] == "Optimal"
+    assert math.isclose(res["total_cost"], expected_cost, rel_tol=1e-9)
+    for e, qty in expected_final.items():
+        assert math.isclose(res["final_composition"][e], qty, abs_tol=1e-9)
+    assert _ratio_holds(res["final_composition"])
+
+
+def test_optimise_mixture_prefers_capped_additions_when_cheaper(monkeypatch):
+    """With additions cheaper than extraction, shortfalls use the 15 % cap first."""
+
+    monkeypatch.setattr(src.model, "ADDITION_PRICES", (1, 1, 1, 1))
+    _solve_mixture.cache_clear()
+    try:
+        initial = {"A": 40, "B": 30, "C": 20, "D": 10}
+        opt = RefrigerantOptimizer(
+            "optimise_mixture", initial_composition=initial, target_weight=120
+        )
+        res = opt.optimize()
+    finally:
+        _solve_mixture.cache_clear()
+
+    assert res["additions"] == {"A": 6.0, "B": 4.5, "C": 3.0, "D": 1.5}
+    for e, qty in {"A": 2.0, "B": 1.5, "C": 1.0, "D": 0.5}.items():
+        assert math.isclose(res["extractions"][e], qty, abs_tol=1e-9)
+    assert math.isclose(res["total_cost"], 15 + 2 * 5 + 1.5 * 6 + 1 * 4 + 0.5 * 7)
+
+
+@pytest.mark.parametrize("target", [0, -10, math.nan, math.inf])
+def test_optimise_mixture_rejects_invalid_target(target):
+    opt = RefrigerantOptimizer(
+        "optimise_mixture", initial_composition={"A": 60}, target_weight=target
+    )
+    with pytest.raises(ValueError):
+        opt.optimize()
+
+
+def test_repeated_optimise_is_cached_and_returns_fresh_results():
+    """Identical queries hit the solve cache without sharing mutable results."""
+
+    initial = {"A": 60, "B": 45, "C": 30, "D": 15}
+    opt = RefrigerantOptimizer("optimise_mixture", initial_composition=initial, target_weight=120)
+
+    _solve_mixture.cache_clear()
+    first = opt.optimize()
+    first["final_composition"]["A"] = -1.0
+    second = opt.optimize()
+
+    assert _solve_mixture.cache_info().hits == 1
+    assert second["final_composition"]["A"] >= 0
+    assert second["total_cost"] == first["total_cost"]
+
+
+def test_repeated_refuel_is_cached_and_returns_fresh_results():
+    initial = {"A": 40, "B": 30, "C": 20, "D": 10}
+    opt = RefrigerantOptimizer("refuel", initial_composition=initial, target_weight=110)
+
+    _solve_refuel.cache_clear()
+    first = opt.optimize()
+    first["additions"]["A"] = -1.0
+    second = opt.optimize()
+
+    assert _solve_refuel.cache_info().hits == 1
+    assert second["additions"] == {"A": 4.0, "B": 3.0, "C": 2.0, "D": 1.0}
+    assert second["total_cost"] == first["total_cost"]